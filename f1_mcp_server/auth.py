@@ -5,10 +5,23 @@ Basic OAuth 2.0 flow for demonstration purposes
 
 import base64
 import hashlib
+import hmac
 import secrets
+import time
 import urllib.parse
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Lifetimes in seconds; expiries are stored as time.monotonic() deadlines
+CODE_TTL = 10 * 60
+ACCESS_TOKEN_TTL = 60 * 60
+REFRESH_TOKEN_TTL = 30 * 24 * 60 * 60
+
+# How often expired codes and tokens are purged from memory
+SWEEP_INTERVAL = 5 * 60
+
+# Upper bound on outstanding authorization codes; oldest are evicted first
+MAX_AUTHORIZATION_CODES = 10_000
 
 class BasicOAuthProvider:
     """Basic OAuth 2.0 provider for demonstration."""
@@ -17,122 +30,181 @@ class BasicOAuthProvider:
         self.client_id = "f1-mcp-client"
         self.client_secret = "f1-mcp-secret-key"
         self.redirect_uri = "http://localhost:8080/callback"
-        self.authorization_codes = {}
-        self.access_tokens = {}
-        self.refresh_tokens = {}
-    
-    def generate_authorization_url(self, state: Optional[str] = None) -> str:
-        """Generate OAuth authorization URL."""
-        if state is None:
-            state = secrets.token_urlsafe(32)
-        
+        # Credentials are compared as fixed-length digests in constant time
+        self._client_id_digest = hashlib.sha256(self.client_id.encode()).digest()
+        self._client_secret_digest = hashlib.sha256(self.client_secret.encode()).digest()
+        # Keyed by SHA-256 digest of the token so that lookups never compare
+        # attacker-controlled strings against stored secrets.
+        self.authorization_codes: "OrderedDict[bytes, dict]" = OrderedDict()
+        self.access_tokens: Dict[bytes, dict] = {}
+        self.refresh_tokens: Dict[bytes, dict] = {}
+        self._last_sweep = time.monotonic()
+        
+        # Only the state parameter varies between authorization URLs
         params = {
             "response_type": "code",
             "client_id": self.client_id,
             "redirect_uri": self.redirect_uri,
             "scope": "f1:read",
-            "state": state
         }
-        
         base_url = "http://localhost:8080/authorize"
-        return f"{base_url}?{urllib.parse.urlencode(params)}"
+        self._auth_url_prefix = f"{base_url}?{urllib.parse.urlencode(params)}&state="
+    
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Return the storage key for a token."""
+        return hashlib.sha256(token.encode()).digest()
+    
+    @staticmethod
+    def _new_token() -> Tuple[str, bytes]:
+        """Issue a random token together with its storage key."""
+        token = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b"=")
+        return token.decode("ascii"), hashlib.sha256(token).digest()
+    
+    @classmethod
+    def _lookup(cls, table: Dict[bytes, dict], presented: Optional[str]) -> Optional[dict]:
+        """Find the entry for a presented token by its digest."""
+        if not presented:
+            return None
+        return table.get(cls._digest(presented))
+    
+    def _maybe_sweep(self, now: Optional[float] = None):
+        """Drop expired codes and tokens if the sweep interval has elapsed."""
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        
+        self.authorization_codes = OrderedDict(
+            (k, v) for k, v in self.authorization_codes.items() if v["expires_at"] > now
+        )
+        self.access_tokens = {
+            k: v for k, v in self.access_tokens.items() if v["expires_at"] > now
+        }
+        self.refresh_tokens = {
+            k: v for k, v in self.refresh_tokens.items() if v["expires_at"] > now
+        }
+    
+    def generate_authorization_url(self, state: Optional[str] = None) -> str:
+        """Generate OAuth authorization URL."""
+        if state is None:
+            state = secrets.token_urlsafe(32)
+        
+        return self._auth_url_prefix + urllib.parse.quote_plus(state)
     
     def generate_authorization_code(self, client_id: str) -> str:
         """Generate authorization code."""
+        now = time.monotonic()
+        self._maybe_sweep(now)
+        
         if client_id != self.client_id:
             raise ValueError("Invalid client_id")
         
-        code = secrets.token_urlsafe(32)
-        self.authorization_codes[code] = {
+        code, code_key = self._new_token()
+        self.authorization_codes[code_key] = {
             "client_id": client_id,
-            "expires_at": datetime.now() + timedelta(minutes=10),
+            "expires_at": now + CODE_TTL,
             "used": False
         }
+        if len(self.authorization_codes) > MAX_AUTHORIZATION_CODES:
+            self.authorization_codes.popitem(last=False)
         return code
     
     def exchange_code_for_token(self, code: str, client_id: str, client_secret: str) -> Dict[str, str]:
         """Exchange authorization code for access token."""
-        if client_id != self.client_id or client_secret != self.client_secret:
+        now = time.monotonic()
+        self._maybe_sweep(now)
+        
+        id_ok = hmac.compare_digest(
+            self._client_id_digest, hashlib.sha256((client_id or "").encode()).digest()
+        )
+        secret_ok = hmac.compare_digest(
+            self._client_secret_digest, hashlib.sha256((client_secret or "").encode()).digest()
+        )
+        if not (id_ok & secret_ok):
             raise ValueError("Invalid client credentials")
         
-        if code not in self.authorization_codes:
+        code_data = self._lookup(self.authorization_codes, code)
+        if code_data is None:
             raise ValueError("Invalid authorization code")
         
-        code_data = self.authorization_codes[code]
-        
         if code_data["used"]:
             raise ValueError("Authorization code already used")
         
-        if datetime.now() > code_data["expires_at"]:
+        if now > code_data["expires_at"]:
             raise ValueError("Authorization code expired")
         
         # Mark code as used
         code_data["used"] = True
         
         # Generate tokens
-        access_token = secrets.token_urlsafe(32)
-        refresh_token = secrets.token_urlsafe(32)
+        access_token, access_key = self._new_token()
+        refresh_token, refresh_key = self._new_token()
         
         # Store tokens
-        self.access_tokens[access_token] = {
+        self.access_tokens[access_key] = {
             "client_id": client_id,
-            "expires_at": datetime.now() + timedelta(hours=1),
+            "expires_at": now + ACCESS_TOKEN_TTL,
             "scope": "f1:read"
         }
         
-        self.refresh_tokens[refresh_token] = {
+        self.refresh_tokens[refresh_key] = {
             "client_id": client_id,
-            "access_token": access_token,
-            "expires_at": datetime.now() + timedelta(days=30)
+            "access_key": access_key,
+            "expires_at": now + REFRESH_TOKEN_TTL
         }
         
         return {
             "access_token": access_token,
             "token_type": "Bearer",
-            "expires_in": 3600,
+            "expires_in": ACCESS_TOKEN_TTL,
             "refresh_token": refresh_token,
             "scope": "f1:read"
         }
     
     def validate_token(self, access_token: str) -> bool:
         """Validate access token."""
-        if access_token not in self.access_tokens:
+        now = time.monotonic()
+        self._maybe_sweep(now)
+        
+        token_data = self._lookup(self.access_tokens, access_token)
+        if token_data is None:
             return False
         
-        token_data = self.access_tokens[access_token]
-        return datetime.now() < token_data["expires_at"]
+        return now < token_data["expires_at"]
     
     def refresh_access_token(self, refresh_token: str) -> Dict[str, str]:
         """Refresh access token using refresh token."""
-        if refresh_token not in self.refresh_tokens:
-            raise ValueError("Invalid refresh token")
+        now = time.monotonic()
+        self._maybe_sweep(now)
         
-        refresh_data = self.refresh_tokens[refresh_token]
+        refresh_data = self._lookup(self.refresh_tokens, refresh_token)
+        if refresh_data is None:
+            raise ValueError("Invalid refresh token")
         
-        if datetime.now() > refresh_data["expires_at"]:
+        if now > refresh_data["expires_at"]:
             raise ValueError("Refresh token expired")
         
         # Invalidate old access token
-        old_access_token = refresh_data["access_token"]
-        if old_access_token in self.access_tokens:
-            del self.access_tokens[old_access_token]
+        self.access_tokens.pop(refresh_data["access_key"], None)
         
         # Generate new access token
-        new_access_token = secrets.token_urlsafe(32)
+        new_access_token, new_access_key = self._new_token()
         
-        self.access_tokens[new_access_token] = {
+        self.access_tokens[new_access_key] = {
             "client_id": refresh_data["client_id"],
-            "expires_at": datetime.now() + timedelta(hours=1),
+            "expires_at": now + ACCESS_TOKEN_TTL,
             "scope": "f1:read"
         }
         
         # Update refresh token mapping
-        refresh_data["access_token"] = new_access_token
+        refresh_data["access_key"] = new_access_key
         
         return {
             "access_token": new_access_token,
             "token_type": "Bearer",
-            "expires_in": 3600,
+            "expires_in": ACCESS_TOKEN_TTL,
             "scope": "f1:read"
         }
 
@@ -10,7 +10,12 @@ from typing import Optional
 
 from .server import app as mcp_app, main as mcp_main
 from .http_server import HTTPStreamServer
-from .auth import oauth_provider
+from .auth import oauth_provider, SWEEP_INTERVAL
+
+try:
+    import uvloop
+except ImportError:  # optional speedup, see the "speedups" extra
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +31,7 @@ class CombinedF1Server:
         """Start only the HTTP server."""
         logger.info("Starting F1 HTTP server...")
         await self.http_server.start()
+        sweeper = asyncio.create_task(self._sweep_tokens())
         
         # Print OAuth information
         auth_url = oauth_provider.generate_authorization_url()
@@ -48,8 +54,15 @@ class CombinedF1Server:
                 await asyncio.sleep(1)
         except KeyboardInterrupt:
             logger.info("Shutting down HTTP server...")
+            sweeper.cancel()
             await self.http_server.stop()
     
+    async def _sweep_tokens(self):
+        """Periodically purge expired OAuth state, even without auth traffic."""
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            oauth_provider._maybe_sweep()
+    
     async def start_mcp_only(self):
         """Start only the MCP server."""
         logger.info("Starting F1 MCP server...")
@@ -104,4 +117,7 @@ async def main():
         )
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
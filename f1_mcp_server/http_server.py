@@ -3,16 +3,295 @@ HTTP streaming server for F1 MCP Server
 Provides HTTP endpoints with OAuth authentication
 """
 
+import html
 import json
+import socket
 import asyncio
 from typing import Dict, Any, Optional
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import unquote_plus
 import logging
 
 from .auth import oauth_provider
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Transport buffer limits for long-lived event streams
+STREAM_WRITE_HIGH_WATER = 64 * 1024
+STREAM_WRITE_LOW_WATER = 16 * 1024
+
+# Requests whose head or body exceeds these are rejected
+MAX_REQUEST_HEAD_SIZE = 64 * 1024
+MAX_REQUEST_BODY_SIZE = 64 * 1024
+
+# Demo update cadence for /f1/stream
+STREAM_UPDATE_INTERVAL = 5
+STREAM_UPDATE_COUNT = 10
+
+# Fixed response shapes, pre-encoded once at import
+_JSON_RESPONSE = (
+    b"HTTP/1.1 %d %s\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+    b"%s"
+)
+_SSE_RESPONSE_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"\r\n"
+)
+_HTML_RESPONSE_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/html\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+)
+_CALLBACK_HEAD = b"""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>OAuth Callback</title>
+</head>
+<body>
+    <h1>OAuth Authorization Complete</h1>
+    <p>Authorization Code: <code>"""
+_CALLBACK_MID = b"""</code></p>
+    <p>State: <code>"""
+_CALLBACK_TAIL = b"""</code></p>
+    <p>You can now exchange this code for an access token.</p>
+</body>
+</html>
+"""
+_CALLBACK_STATIC_LENGTH = len(_CALLBACK_HEAD) + len(_CALLBACK_MID) + len(_CALLBACK_TAIL)
+_SSE_PREFIX = b"event: "
+_SSE_MID = b"\ndata: "
+_SSE_SUF = b"\n\n"
+
+
+def _json_bytes(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _encode_sse(event_type: str, data: Dict[str, Any]) -> bytes:
+    """Encode a single Server-Sent Event frame."""
+    return b"".join((_SSE_PREFIX, event_type.encode(), _SSE_MID, _json_bytes(data), _SSE_SUF))
+
+
+def _parse_request_head(head: bytes):
+    """Split a raw request head into method, target and lower-cased headers."""
+    request_line, _, header_block = head.rstrip(b"\r\n").partition(b"\r\n")
+    method, path, _version = request_line.decode().split(" ", 2)
+    
+    headers = {}
+    for line in header_block.split(b"\r\n"):
+        key, sep, value = line.partition(b":")
+        if sep:
+            headers[key.strip().lower().decode()] = value.strip().decode()
+    return method, path, headers
+
+
+def _parse_query(query: str) -> Dict[str, str]:
+    """Parse a query string, keeping the first non-empty value per key."""
+    params = {}
+    if not query:
+        return params
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if value:
+            params.setdefault(unquote_plus(key), unquote_plus(value))
+    return params
+
+
+class _StreamTicker:
+    """One update clock shared by every open stream.
+    
+    A single producer task wakes all subscribers per tick, instead of each
+    stream running its own sleep loop. Encoded frames are cached per tick so
+    identical updates are serialized once and broadcast to every writer.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.timestamp = None
+        self._tick = asyncio.Event()
+        self._frames: Dict[tuple, bytes] = {}
+        self._subscribers = 0
+        self._task = None
+    
+    def subscribe(self):
+        self._subscribers += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    def unsubscribe(self):
+        self._subscribers -= 1
+    
+    async def wait(self):
+        """Wait for the next tick."""
+        await self._tick.wait()
+    
+    def update_frame(self, update_number: int, year: int) -> bytes:
+        """Return the encoded update event for the current tick."""
+        key = (update_number, year)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = _encode_sse("f1_update", {
+                "type": "update",
+                "timestamp": self.timestamp,
+                "message": f"Stream update #{update_number}",
+                "year": year
+            })
+            self._frames[key] = frame
+        return frame
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            self.timestamp = str(loop.time())
+            self._frames.clear()
+            tick, self._tick = self._tick, asyncio.Event()
+            tick.set()
+        self._task = None
+
+
+class _PayloadTooLarge(ValueError):
+    """Raised when a request declares a body over MAX_REQUEST_BODY_SIZE."""
+
+
+class _HTTPProtocol(asyncio.Protocol):
+    """Reads one request per connection straight off the transport.
+    
+    The protocol also acts as the response writer, exposing the subset of the
+    ``StreamWriter`` interface the handlers use, so responses skip the extra
+    buffering and futures of the streams layer.
+    """
+    
+    def __init__(self, server: "HTTPStreamServer"):
+        self._server = server
+        self.transport = None
+        self._buffer = bytearray()
+        self._head = None
+        self._body_length = 0
+        self._task = None
+        self._paused = False
+        self._drain_waiters = []
+        self._closed = None
+        self.headers_sent = False
+    
+    # asyncio.Protocol callbacks
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        self._closed = asyncio.get_running_loop().create_future()
+    
+    def data_received(self, data: bytes):
+        if self._task is not None:
+            return
+        self._buffer += data
+        
+        if self._head is None:
+            end = self._buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self._buffer) > MAX_REQUEST_HEAD_SIZE:
+                    self._dispatch(ValueError("Request head too large"))
+                return
+            try:
+                self._head = _parse_request_head(bytes(self._buffer[:end + 4]))
+                self._body_length = int(self._head[2].get("content-length", 0))
+                if self._body_length < 0:
+                    raise ValueError("Invalid Content-Length")
+                # Only /token form posts carry a body; refuse before buffering it
+                if self._body_length > MAX_REQUEST_BODY_SIZE:
+                    raise _PayloadTooLarge("Request body too large")
+            except Exception as e:
+                self._dispatch(e)
+                return
+            del self._buffer[:end + 4]
+        
+        if len(self._buffer) >= self._body_length:
+            method, path, headers = self._head
+            self._dispatch((method, path, headers, bytes(self._buffer[:self._body_length])))
+    
+    def eof_received(self):
+        if self._task is not None:
+            # Keep the write side open for the response
+            return True
+        if self._head is not None or self._buffer.strip():
+            # Peer hung up mid-head or before the announced body arrived
+            self._dispatch(ConnectionError("Incomplete request"))
+            return True
+        return False
+    
+    def connection_lost(self, exc):
+        if not self._closed.done():
+            self._closed.set_result(None)
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionResetError("Connection lost"))
+        self._drain_waiters.clear()
+    
+    def pause_writing(self):
+        self._paused = True
+    
+    def resume_writing(self):
+        self._paused = False
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+    
+    def _dispatch(self, request):
+        self._buffer.clear()
+        self._task = asyncio.get_running_loop().create_task(
+            self._server.handle_request(self, request)
+        )
+    
+    # StreamWriter-compatible surface used by the handlers
+    
+    def write(self, data: bytes):
+        # Writes after the peer has gone are dropped; uvloop raises on a closed handle
+        if self.transport.is_closing():
+            return
+        self.headers_sent = True
+        self.transport.write(data)
+    
+    def writelines(self, data):
+        if self.transport.is_closing():
+            return
+        self.headers_sent = True
+        self.transport.writelines(data)
+    
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        return self.transport.get_extra_info(name, default)
+    
+    async def drain(self):
+        if self._closed.done():
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+    
+    def close(self):
+        self.transport.close()
+    
+    async def wait_closed(self):
+        await self._closed
+
+
 class HTTPStreamServer:
     """Basic HTTP server with streaming support."""
     
@@ -20,15 +299,17 @@ class HTTPStreamServer:
         self.host = host
         self.port = port
         self.server = None
+        self._ticker = _StreamTicker(STREAM_UPDATE_INTERVAL)
     
     async def start(self):
         """Start the HTTP server."""
-        self.server = await asyncio.start_server(
-            self.handle_client,
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            lambda: _HTTPProtocol(self),
             self.host,
             self.port
         )
-        logger.info(f"HTTP server started on {self.host}:{self.port}")
+        logger.info("HTTP server started on %s:%s", self.host, self.port)
         
     async def stop(self):
         """Stop the HTTP server."""
@@ -36,38 +317,23 @@ class HTTPStreamServer:
             self.server.close()
             await self.server.wait_closed()
     
-    async def handle_client(self, reader, writer):
-        """Handle incoming HTTP requests."""
+    async def handle_request(self, writer, request):
+        """Serve one request and close the connection.
+        
+        ``request`` is the parsed ``(method, path, headers, body)`` tuple, or
+        the exception raised while reading it.
+        """
         try:
-            # Read HTTP request
-            request_line = await reader.readline()
-            if not request_line:
-                return
-            
-            request_line = request_line.decode().strip()
-            method, path, version = request_line.split(' ', 2)
-            
-            # Read headers
-            headers = {}
-            while True:
-                line = await reader.readline()
-                if line == b'\r\n':
-                    break
-                if line:
-                    key, value = line.decode().strip().split(':', 1)
-                    headers[key.lower()] = value.strip()
-            
-            # Read body if present
-            body = b""
-            if 'content-length' in headers:
-                content_length = int(headers['content-length'])
-                body = await reader.read(content_length)
+            if isinstance(request, Exception):
+                raise request
             
             # Route request
-            await self.route_request(writer, method, path, headers, body)
+            await self.route_request(writer, *request)
             
+        except _PayloadTooLarge:
+            await self.send_error(writer, 413, "Payload Too Large")
         except Exception as e:
-            logger.error(f"Error handling request: {e}")
+            logger.error("Error handling request: %s", e)
             await self.send_error(writer, 500, "Internal Server Error")
         finally:
             writer.close()
@@ -75,9 +341,8 @@ class HTTPStreamServer:
     
     async def route_request(self, writer, method: str, path: str, headers: Dict[str, str], body: bytes):
         """Route HTTP requests to appropriate handlers."""
-        parsed_url = urlparse(path)
-        path_only = parsed_url.path
-        query_params = parse_qs(parsed_url.query)
+        path_only, _, query = path.partition("?")
+        query_params = _parse_query(query)
         
         if path_only == "/authorize" and method == "GET":
             await self.handle_authorize(writer, query_params)
@@ -90,12 +355,12 @@ class HTTPStreamServer:
         else:
             await self.send_error(writer, 404, "Not Found")
     
-    async def handle_authorize(self, writer, query_params: Dict[str, list]):
+    async def handle_authorize(self, writer, query_params: Dict[str, str]):
         """Handle OAuth authorization endpoint."""
         try:
-            client_id = query_params.get("client_id", [None])[0]
-            redirect_uri = query_params.get("redirect_uri", [None])[0]
-            state = query_params.get("state", [None])[0]
+            client_id = query_params.get("client_id")
+            redirect_uri = query_params.get("redirect_uri")
+            state = query_params.get("state")
             
             if not client_id:
                 await self.send_error(writer, 400, "Missing client_id")
@@ -114,8 +379,8 @@ Location: {redirect_url}\r
 Content-Length: 0\r
 \r
 """
+            # One-shot responses are flushed when handle_request closes the protocol in its finally
             writer.write(response.encode())
-            await writer.drain()
             
         except Exception as e:
             await self.send_error(writer, 400, str(e))
@@ -124,40 +389,32 @@ Content-Length: 0\r
         """Handle OAuth token endpoint."""
         try:
             # Parse form data
-            body_str = body.decode()
-            params = parse_qs(body_str)
+            params = _parse_query(body.decode())
             
-            grant_type = params.get("grant_type", [None])[0]
+            grant_type = params.get("grant_type")
             
             if grant_type == "authorization_code":
-                code = params.get("code", [None])[0]
-                client_id = params.get("client_id", [None])[0]
-                client_secret = params.get("client_secret", [None])[0]
+                code = params.get("code")
+                client_id = params.get("client_id")
+                client_secret = params.get("client_secret")
                 
                 token_data = oauth_provider.exchange_code_for_token(code, client_id, client_secret)
                 
             elif grant_type == "refresh_token":
-                refresh_token = params.get("refresh_token", [None])[0]
+                refresh_token = params.get("refresh_token")
                 token_data = oauth_provider.refresh_access_token(refresh_token)
                 
             else:
                 await self.send_error(writer, 400, "Unsupported grant_type")
                 return
             
-            response_body = json.dumps(token_data)
-            response = f"""HTTP/1.1 200 OK\r
-Content-Type: application/json\r
-Content-Length: {len(response_body)}\r
-\r
-{response_body}"""
-            
-            writer.write(response.encode())
-            await writer.drain()
+            response_body = _json_bytes(token_data)
+            writer.write(_JSON_RESPONSE % (200, b"OK", len(response_body), response_body))
             
         except Exception as e:
             await self.send_error(writer, 400, str(e))
     
-    async def handle_f1_stream(self, writer, headers: Dict[str, str], query_params: Dict[str, list]):
+    async def handle_f1_stream(self, writer, headers: Dict[str, str], query_params: Dict[str, str]):
         """Handle F1 data streaming endpoint."""
         try:
             # Check authorization
@@ -172,27 +429,21 @@ Content-Length: {len(response_body)}\r
                 return
             
             # Start streaming response
-            response_headers = """HTTP/1.1 200 OK\r
-Content-Type: text/event-stream\r
-Cache-Control: no-cache\r
-Connection: keep-alive\r
-Access-Control-Allow-Origin: *\r
-\r
-"""
-            writer.write(response_headers.encode())
-            await writer.drain()
+            self._tune_stream_transport(writer)
+            # Headers are flushed together with the first event
+            writer.write(_SSE_RESPONSE_HEAD)
             
             # Stream F1 data
             await self.stream_f1_data(writer, query_params)
             
         except Exception as e:
-            logger.error(f"Error in F1 stream: {e}")
+            logger.error("Error in F1 stream: %s", e)
             await self.send_error(writer, 500, str(e))
     
-    async def stream_f1_data(self, writer, query_params: Dict[str, list]):
+    async def stream_f1_data(self, writer, query_params: Dict[str, str]):
         """Stream F1 data as Server-Sent Events."""
         try:
-            year = int(query_params.get("year", ["2024"])[0])
+            year = int(query_params.get("year", "2024"))
             
             # Send initial data
             event_data = {
@@ -203,18 +454,14 @@ Access-Control-Allow-Origin: *\r
             
             await self.send_sse_event(writer, "f1_data", event_data)
             
-            # Simulate streaming updates every 5 seconds
-            for i in range(10):
-                await asyncio.sleep(5)
-                
-                update_data = {
-                    "type": "update",
-                    "timestamp": str(asyncio.get_event_loop().time()),
-                    "message": f"Stream update #{i + 1}",
-                    "year": year
-                }
-                
-                await self.send_sse_event(writer, "f1_update", update_data)
+            # Simulated updates, paced by the shared ticker
+            self._ticker.subscribe()
+            try:
+                for i in range(STREAM_UPDATE_COUNT):
+                    await self._ticker.wait()
+                    await self._send_frame(writer, self._ticker.update_frame(i + 1, year))
+            finally:
+                self._ticker.unsubscribe()
             
             # Send completion event
             completion_data = {
@@ -230,51 +477,42 @@ Access-Control-Allow-Origin: *\r
             }
             await self.send_sse_event(writer, "f1_error", error_data)
     
+    def _tune_stream_transport(self, writer):
+        """Configure a connection for low-latency event streaming."""
+        writer.transport.set_write_buffer_limits(
+            high=STREAM_WRITE_HIGH_WATER, low=STREAM_WRITE_LOW_WATER
+        )
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
     async def send_sse_event(self, writer, event_type: str, data: Dict[str, Any]):
         """Send Server-Sent Event."""
-        event = f"event: {event_type}\n"
-        event += f"data: {json.dumps(data)}\n\n"
-        
-        writer.write(event.encode())
-        await writer.drain()
+        await self._send_frame(writer, _encode_sse(event_type, data))
     
-    async def handle_callback(self, writer, query_params: Dict[str, list]):
+    async def _send_frame(self, writer, frame: bytes):
+        """Queue an encoded frame, waiting only when the client falls behind."""
+        if writer.transport.is_closing():
+            raise ConnectionResetError("Stream client disconnected")
+        writer.write(frame)
+        if writer.transport.get_write_buffer_size() > STREAM_WRITE_HIGH_WATER:
+            await writer.drain()
+    
+    async def handle_callback(self, writer, query_params: Dict[str, str]):
         """Handle OAuth callback (for testing)."""
-        code = query_params.get("code", [None])[0]
-        state = query_params.get("state", [None])[0]
-        
-        response_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>OAuth Callback</title>
-</head>
-<body>
-    <h1>OAuth Authorization Complete</h1>
-    <p>Authorization Code: <code>{code}</code></p>
-    <p>State: <code>{state}</code></p>
-    <p>You can now exchange this code for an access token.</p>
-</body>
-</html>
-"""
-        
-        response = f"""HTTP/1.1 200 OK\r
-Content-Type: text/html\r
-Content-Length: {len(response_body)}\r
-\r
-{response_body}"""
+        code = html.escape(str(query_params.get("code"))).encode()
+        state = html.escape(str(query_params.get("state"))).encode()
         
-        writer.write(response.encode())
-        await writer.drain()
+        content_length = _CALLBACK_STATIC_LENGTH + len(code) + len(state)
+        writer.writelines([
+            _HTML_RESPONSE_HEAD % content_length,
+            _CALLBACK_HEAD, code, _CALLBACK_MID, state, _CALLBACK_TAIL,
+        ])
     
     async def send_error(self, writer, status_code: int, message: str):
         """Send HTTP error response."""
-        response_body = json.dumps({"error": message})
-        response = f"""HTTP/1.1 {status_code} {message}\r
-Content-Type: application/json\r
-Content-Length: {len(response_body)}\r
-\r
-{response_body}"""
-        
-        writer.write(response.encode())
-        await writer.drain()
\ No newline at end of file
+        if writer.headers_sent or writer.transport.is_closing():
+            # Too late for a status line; the connection is closed by handle_request
+            return
+        response_body = _json_bytes({"error": message})
+        writer.write(_JSON_RESPONSE % (status_code, message.encode(), len(response_body), response_body))
\ No newline at end of file
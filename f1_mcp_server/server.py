@@ -4,10 +4,14 @@ F1 MCP Server - Formula 1 data provider using FastF1
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import tempfile
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
-from datetime import datetime
 
 import fastf1
 import pandas as pd
@@ -23,6 +27,11 @@ from mcp.types import (
 )
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("f1-mcp-server")
@@ -32,17 +41,35 @@ import os
 cache_dir = "cache"
 if not os.path.exists(cache_dir):
     os.makedirs(cache_dir, exist_ok=True)
-    logger.info(f"Created cache directory: {cache_dir}")
+    logger.info("Created cache directory: %s", cache_dir)
 
 try:
     fastf1.Cache.enable_cache(cache_dir)
-    logger.info(f"FastF1 cache enabled at: {cache_dir}")
+    logger.info("FastF1 cache enabled at: %s", cache_dir)
 except Exception as e:
-    logger.warning(f"Failed to enable FastF1 cache: {e}")
+    logger.warning("Failed to enable FastF1 cache: %s", e)
     logger.info("Continuing without cache - data will be fetched fresh each time")
 
+# Rendered tool results, stored per request so repeat calls (and other
+# server processes sharing the cache) skip reloading and re-deriving them.
+# Entries expire like loaded sessions; bump the version when the output
+# format changes so older entries are never served.
+DERIVED_CACHE_DIR = os.path.join(cache_dir, "derived")
+DERIVED_CACHE_VERSION = 1
+
 app = Server("f1-mcp-server")
 
+# Loaded sessions are kept in memory and reused for this long
+SESSION_CACHE_TTL = 60 * 60
+SESSION_CACHE_SIZE = 64
+
+# (year, round, session) -> (expires_at, load task)
+_session_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# (year, round, session) -> (loaded session, {driver: laps}), dropped with
+# the session cache entry
+_laps_by_driver: Dict[tuple, tuple] = {}
+
 
 class F1SessionRequest(BaseModel):
     """Request model for F1 session data."""
@@ -53,6 +80,9 @@ class F1SessionRequest(BaseModel):
         None, description="Event name (e.g., 'Monaco Grand Prix')"
     )
     session: str = Field(..., description="Session type: 'FP1', 'FP2', 'FP3', 'Q', 'R'")
+    driver: Optional[str] = Field(
+        None, description="Driver abbreviation (e.g., 'VER', 'HAM')"
+    )
 
 
 class F1StandingsRequest(BaseModel):
@@ -64,174 +94,306 @@ class F1StandingsRequest(BaseModel):
     )
 
 
-@app.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available F1 data tools."""
-    return [
-        Tool(
-            name="get_race_schedule",
-            description="Get the race schedule for a specific F1 season",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Season year (e.g., 2024)",
-                        "minimum": 1950,
-                        "maximum": 2030,
-                    }
-                },
-                "required": ["year"],
+# Tool definitions are static, so build them once at import
+_TOOLS = [
+    Tool(
+        name="get_race_schedule",
+        description="Get the race schedule for a specific F1 season",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Season year (e.g., 2024)",
+                    "minimum": 1950,
+                    "maximum": 2030,
+                }
             },
-        ),
-        Tool(
-            name="get_session_results",
-            description="Get results for a specific F1 session (practice, qualifying, or race)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Season year (e.g., 2024)",
-                    },
-                    "round_number": {
-                        "type": "integer",
-                        "description": "Round number (1-24)",
-                        "minimum": 1,
-                        "maximum": 24,
-                    },
-                    "session": {
-                        "type": "string",
-                        "description": "Session type",
-                        "enum": ["FP1", "FP2", "FP3", "Q", "R"],
-                    },
+            "required": ["year"],
+        },
+    ),
+    Tool(
+        name="get_session_results",
+        description="Get results for a specific F1 session (practice, qualifying, or race)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Season year (e.g., 2024)",
+                },
+                "round_number": {
+                    "type": "integer",
+                    "description": "Round number (1-24)",
+                    "minimum": 1,
+                    "maximum": 24,
+                },
+                "session": {
+                    "type": "string",
+                    "description": "Session type",
+                    "enum": ["FP1", "FP2", "FP3", "Q", "R"],
                 },
-                "required": ["year", "round_number", "session"],
             },
-        ),
-        Tool(
-            name="get_driver_standings",
-            description="Get driver championship standings for a season",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Season year (e.g., 2024)",
-                    },
-                    "round_number": {
-                        "type": "integer",
-                        "description": "Round number (optional, gets standings after this round)",
-                        "minimum": 1,
-                        "maximum": 24,
-                    },
+            "required": ["year", "round_number", "session"],
+        },
+    ),
+    Tool(
+        name="get_driver_standings",
+        description="Get driver championship standings for a season",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Season year (e.g., 2024)",
+                },
+                "round_number": {
+                    "type": "integer",
+                    "description": "Round number (optional, gets standings after this round)",
+                    "minimum": 1,
+                    "maximum": 24,
                 },
-                "required": ["year"],
             },
-        ),
-        Tool(
-            name="get_constructor_standings",
-            description="Get constructor championship standings for a season",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Season year (e.g., 2024)",
-                    },
-                    "round_number": {
-                        "type": "integer",
-                        "description": "Round number (optional, gets standings after this round)",
-                        "minimum": 1,
-                        "maximum": 24,
-                    },
+            "required": ["year"],
+        },
+    ),
+    Tool(
+        name="get_constructor_standings",
+        description="Get constructor championship standings for a season",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Season year (e.g., 2024)",
+                },
+                "round_number": {
+                    "type": "integer",
+                    "description": "Round number (optional, gets standings after this round)",
+                    "minimum": 1,
+                    "maximum": 24,
                 },
-                "required": ["year"],
             },
-        ),
-        Tool(
-            name="get_lap_times",
-            description="Get lap times for a specific session",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Season year (e.g., 2024)",
-                    },
-                    "round_number": {
-                        "type": "integer",
-                        "description": "Round number (1-24)",
-                    },
-                    "session": {
-                        "type": "string",
-                        "description": "Session type",
-                        "enum": ["FP1", "FP2", "FP3", "Q", "R"],
-                    },
-                    "driver": {
-                        "type": "string",
-                        "description": "Driver abbreviation (optional, e.g., 'VER', 'HAM')",
-                    },
+            "required": ["year"],
+        },
+    ),
+    Tool(
+        name="get_lap_times",
+        description="Get lap times for a specific session",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Season year (e.g., 2024)",
+                },
+                "round_number": {
+                    "type": "integer",
+                    "description": "Round number (1-24)",
+                },
+                "session": {
+                    "type": "string",
+                    "description": "Session type",
+                    "enum": ["FP1", "FP2", "FP3", "Q", "R"],
+                },
+                "driver": {
+                    "type": "string",
+                    "description": "Driver abbreviation (optional, e.g., 'VER', 'HAM')",
                 },
-                "required": ["year", "round_number", "session"],
             },
-        ),
-    ]
+            "required": ["year", "round_number", "session"],
+        },
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available F1 data tools."""
+    return _TOOLS
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls for F1 data."""
+    handler = _DISPATCH.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
     try:
-        if name == "get_race_schedule":
-            return await get_race_schedule(arguments)
-        elif name == "get_session_results":
-            return await get_session_results(arguments)
-        elif name == "get_driver_standings":
-            return await get_driver_standings(arguments)
-        elif name == "get_constructor_standings":
-            return await get_constructor_standings(arguments)
-        elif name == "get_lap_times":
-            return await get_lap_times(arguments)
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        return await handler(arguments)
     except Exception as e:
-        logger.error(f"Error in tool {name}: {str(e)}")
+        logger.error("Error in tool %s: %s", name, e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+@functools.lru_cache(maxsize=32)
+def _schedule(year: int) -> pd.DataFrame:
+    """Get a season's event schedule, memoized per year."""
+    schedule = fastf1.get_event_schedule(year)
+    # Cast once so date comparisons take the vectorized datetime64 path
+    schedule["EventDate"] = pd.to_datetime(schedule["EventDate"])
+    return schedule
+
+
+@functools.lru_cache(maxsize=16)
+def _latest_round(year: int, today: pd.Timestamp) -> int:
+    """Get the last round held on or before ``today``, defaulting to 1."""
+    schedule = _schedule(year)
+    completed = schedule.loc[schedule["EventDate"] <= today, "RoundNumber"]
+    return int(completed.max()) if not completed.empty else 1
+
+
+async def _fetch_session(year: int, round_number: int, session_type: str):
+    """Create and load a FastF1 session off the event loop."""
+    session = await asyncio.to_thread(
+        fastf1.get_session, year, round_number, session_type
+    )
+    await asyncio.to_thread(session.load)
+    return session
+
+
+async def _load_session(year: int, round_number: int, session_type: str):
+    """Get a loaded session, sharing recent and in-flight loads."""
+    key = (year, round_number, session_type)
+    now = time.monotonic()
+    entry = _session_cache.get(key)
+    if entry is None or entry[0] <= now:
+        entry = (now + SESSION_CACHE_TTL, asyncio.ensure_future(_fetch_session(*key)))
+        _session_cache[key] = entry
+        _laps_by_driver.pop(key, None)
+        while len(_session_cache) > SESSION_CACHE_SIZE:
+            evicted, _ = _session_cache.popitem(last=False)
+            _laps_by_driver.pop(evicted, None)
+    else:
+        _session_cache.move_to_end(key)
+
+    try:
+        # Shielded so one cancelled caller doesn't abort a load others await
+        return await asyncio.shield(entry[1])
+    except Exception:
+        if _session_cache.get(key) is entry:
+            del _session_cache[key]
+        raise
+
+
+def _driver_laps(key: tuple, session) -> Dict[str, pd.DataFrame]:
+    """Get a loaded session's laps split by driver, built once per session."""
+    cached = _laps_by_driver.get(key)
+    if cached is not None and cached[0] is session:
+        return cached[1]
+    laps = session.laps
+    by_driver = dict(
+        tuple(laps.groupby(laps["Driver"].astype("category"), observed=True))
+    )
+    _laps_by_driver[key] = (session, by_driver)
+    return by_driver
+
+
+def _derived_path(kind: str, *key: Any) -> str:
+    """Get the derived-result cache file for a tool result key."""
+    # Hash the key: it carries user-supplied strings unfit for file names
+    key = (DERIVED_CACHE_VERSION, kind, *key)
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()
+    return os.path.join(DERIVED_CACHE_DIR, f"{kind}-{digest}.json")
+
+
+def _read_derived(path: str) -> Optional[str]:
+    """Load a cached tool result text, or None if missing, expired or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            entry = json.loads(f.read())
+        if entry["expires_at"] <= time.time():
+            return None
+        return entry["text"]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable derived cache entry %s: %s", path, e)
+        return None
+
+
+def _write_derived(path: str, text: str) -> None:
+    """Persist a tool result text for later calls, replacing any older copy."""
+    # Wall-clock deadline, since entries outlive this process
+    entry = {"expires_at": time.time() + SESSION_CACHE_TTL, "text": text}
+    try:
+        os.makedirs(DERIVED_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=DERIVED_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning("Failed to write derived cache entry %s: %s", path, e)
+
+
+def _text_result(title: str, result: Dict[str, Any]) -> List[TextContent]:
+    """Render a titled JSON result as a single MCP text block."""
+    if orjson is not None:
+        payload = orjson.dumps(
+            result,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY,
+        )
+        # Join as bytes so the JSON payload is decoded exactly once
+        text = b"".join((title.encode(), b":\n\n", payload)).decode()
+    else:
+        text = "".join(
+            (title, ":\n\n", json.dumps(result, indent=2, ensure_ascii=False))
+        )
+    return [TextContent(type="text", text=text)]
+
+
+def _int_column(column: pd.Series) -> pd.Series:
+    """Convert a column to Python ints, mapping missing values to None."""
+    column = column.astype("Int64")
+    return column.astype(object).where(column.notna(), None)
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    """Convert a pandas scalar to str, mapping missing values to None."""
+    return None if pd.isna(value) else str(value)
+
+
+def _points_column(results: pd.DataFrame) -> pd.Series:
+    """Get a results frame's points as floats, treating missing as zero."""
+    if "Points" not in results.columns:
+        return pd.Series(0.0, index=results.index)
+    return results["Points"].fillna(0).astype(float)
+
+
+# Schedule columns exposed by get_race_schedule, mapped to their output keys
+_SCHEDULE_COLUMNS = {
+    "RoundNumber": "round",
+    "EventName": "event_name",
+    "Location": "location",
+    "Country": "country",
+    "EventDate": "event_date",
+    "EventFormat": "event_format",
+}
+
+
 async def get_race_schedule(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get race schedule for a season."""
     year = arguments["year"]
 
     try:
-        schedule = fastf1.get_event_schedule(year)
-
-        # Convert to a more readable format
-        schedule_data = []
-        for _, event in schedule.iterrows():
-            schedule_data.append(
-                {
-                    "round": (
-                        int(event["RoundNumber"])
-                        if pd.notna(event["RoundNumber"])
-                        else None
-                    ),
-                    "event_name": event["EventName"],
-                    "location": event["Location"],
-                    "country": event["Country"],
-                    "event_date": (
-                        event["EventDate"].strftime("%Y-%m-%d")
-                        if pd.notna(event["EventDate"])
-                        else None
-                    ),
-                    "event_format": (
-                        event["EventFormat"]
-                        if "EventFormat" in event
-                        else "Conventional"
-                    ),
-                }
-            )
+        schedule = await asyncio.to_thread(_schedule, year)
+
+        # Convert to a more readable format, column-wise
+        events = schedule.reindex(columns=list(_SCHEDULE_COLUMNS))
+        events["RoundNumber"] = events["RoundNumber"].astype("Int64")
+        events["EventDate"] = events["EventDate"].dt.strftime("%Y-%m-%d")
+        events["EventFormat"] = events["EventFormat"].fillna("Conventional")
+        events = events.astype(object).where(events.notna(), None)
+        schedule_data = events.rename(columns=_SCHEDULE_COLUMNS).to_dict(
+            orient="records"
+        )
 
         result = {
             "season": year,
@@ -239,12 +401,7 @@ async def get_race_schedule(arguments: Dict[str, Any]) -> List[TextContent]:
             "events": schedule_data,
         }
 
-        return [
-            TextContent(
-                type="text",
-                text=f"F1 {year} Race Schedule:\n\n" + json.dumps(result, indent=2),
-            )
-        ]
+        return _text_result(f"F1 {year} Race Schedule", result)
 
     except Exception as e:
         return [
@@ -256,41 +413,42 @@ async def get_race_schedule(arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def get_session_results(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get session results."""
-    year = arguments["year"]
-    round_number = arguments["round_number"]
-    session_type = arguments["session"]
+    request = F1SessionRequest.model_validate(arguments)
+    if request.round_number is None:
+        raise ValueError("round_number is required")
+    year = request.year
+    round_number = request.round_number
+    session_type = request.session
 
     try:
-        session = fastf1.get_session(year, round_number, session_type)
-        session.load()
+        cache_path = _derived_path("results", year, round_number, session_type)
+        text = await asyncio.to_thread(_read_derived, cache_path)
+        if text is not None:
+            return [TextContent(type="text", text=text)]
+
+        session = await _load_session(year, round_number, session_type)
 
         results = session.results
+        results = results.assign(
+            Position=_int_column(results["Position"]),
+            DriverNumber=_int_column(results["DriverNumber"]),
+            Points=_points_column(results),
+        )
 
         # Convert results to readable format
+        has_status = "Status" in results.columns
         results_data = []
-        for _, driver in results.iterrows():
+        for driver in results.itertuples(index=False):
             results_data.append(
                 {
-                    "position": (
-                        int(driver["Position"])
-                        if pd.notna(driver["Position"])
-                        else None
-                    ),
-                    "driver_number": (
-                        int(driver["DriverNumber"])
-                        if pd.notna(driver["DriverNumber"])
-                        else None
-                    ),
-                    "driver": driver["Abbreviation"],
-                    "full_name": driver["FullName"],
-                    "team": driver["TeamName"],
-                    "time": str(driver["Time"]) if pd.notna(driver["Time"]) else None,
-                    "status": driver["Status"] if "Status" in driver else None,
-                    "points": (
-                        float(driver["Points"])
-                        if pd.notna(driver.get("Points", 0))
-                        else 0
-                    ),
+                    "position": driver.Position,
+                    "driver_number": driver.DriverNumber,
+                    "driver": driver.Abbreviation,
+                    "full_name": driver.FullName,
+                    "team": driver.TeamName,
+                    "time": _str_or_none(driver.Time),
+                    "status": driver.Status if has_status else None,
+                    "points": driver.Points,
                 }
             )
 
@@ -302,14 +460,11 @@ async def get_session_results(arguments: Dict[str, Any]) -> List[TextContent]:
             "location": session.event["Location"],
             "results": results_data,
         }
-
-        return [
-            TextContent(
-                type="text",
-                text=f"F1 {year} Round {round_number} {session_type} Results:\n\n"
-                + json.dumps(result, indent=2),
-            )
-        ]
+        content = _text_result(
+            f"F1 {year} Round {round_number} {session_type} Results", result
+        )
+        await asyncio.to_thread(_write_derived, cache_path, content[0].text)
+        return content
 
     except Exception as e:
         return [
@@ -319,51 +474,41 @@ async def get_session_results(arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def get_driver_standings(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get driver championship standings."""
-    year = arguments["year"]
-    round_number = arguments.get("round_number")
+    request = F1StandingsRequest.model_validate(arguments)
+    year = request.year
+    round_number = request.round_number
 
     try:
-        # Get the schedule to determine which round to use
-        schedule = fastf1.get_event_schedule(year)
-
         if round_number is None:
             # Get latest completed round
-            current_date = datetime.now()
-            completed_rounds = schedule[schedule["EventDate"] <= current_date]
-            if completed_rounds.empty:
-                round_number = 1
-            else:
-                round_number = int(completed_rounds["RoundNumber"].max())
+            round_number = await asyncio.to_thread(
+                _latest_round, year, pd.Timestamp.now().normalize()
+            )
 
         # Get race session for standings calculation
-        session = fastf1.get_session(year, round_number, "R")
-        session.load()
+        session = await _load_session(year, round_number, "R")
 
         # Calculate standings (simplified - in real implementation you'd sum points across all rounds)
         results = session.results
+        results = results.assign(
+            Position=_int_column(results["Position"]),
+            Points=_points_column(results),
+        )
         standings_data = []
 
-        for _, driver in results.iterrows():
+        for driver in results.itertuples(index=False):
             standings_data.append(
                 {
-                    "position": (
-                        int(driver["Position"])
-                        if pd.notna(driver["Position"])
-                        else None
-                    ),
-                    "driver": driver["Abbreviation"],
-                    "full_name": driver["FullName"],
-                    "team": driver["TeamName"],
-                    "points": (
-                        float(driver["Points"])
-                        if pd.notna(driver.get("Points", 0))
-                        else 0
-                    ),
+                    "position": driver.Position,
+                    "driver": driver.Abbreviation,
+                    "full_name": driver.FullName,
+                    "team": driver.TeamName,
+                    "points": driver.Points,
                 }
             )
 
         # Sort by points (descending)
-        standings_data.sort(key=lambda x: x["points"] or 0, reverse=True)
+        standings_data.sort(key=lambda x: x["points"], reverse=True)
 
         result = {
             "year": year,
@@ -371,13 +516,9 @@ async def get_driver_standings(arguments: Dict[str, Any]) -> List[TextContent]:
             "standings": standings_data,
         }
 
-        return [
-            TextContent(
-                type="text",
-                text=f"F1 {year} Driver Standings (after Round {round_number}):\n\n"
-                + json.dumps(result, indent=2),
-            )
-        ]
+        return _text_result(
+            f"F1 {year} Driver Standings (after Round {round_number})", result
+        )
 
     except Exception as e:
         return [
@@ -387,59 +528,49 @@ async def get_driver_standings(arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def get_constructor_standings(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get constructor championship standings."""
-    year = arguments["year"]
-    round_number = arguments.get("round_number")
+    request = F1StandingsRequest.model_validate(arguments)
+    year = request.year
+    round_number = request.round_number
 
     try:
-        # Get the schedule to determine which round to use
-        schedule = fastf1.get_event_schedule(year)
-
         if round_number is None:
             # Get latest completed round
-            current_date = datetime.now()
-            completed_rounds = schedule[schedule["EventDate"] <= current_date]
-            if completed_rounds.empty:
-                round_number = 1
-            else:
-                round_number = int(completed_rounds["RoundNumber"].max())
+            round_number = await asyncio.to_thread(
+                _latest_round, year, pd.Timestamp.now().normalize()
+            )
 
         # Get race session for standings calculation
-        session = fastf1.get_session(year, round_number, "R")
-        session.load()
+        session = await _load_session(year, round_number, "R")
 
         results = session.results
 
         # Group by team and sum points
-        team_points = {}
-        for _, driver in results.iterrows():
-            team = driver["TeamName"]
-            points = float(driver["Points"]) if pd.notna(driver.get("Points", 0)) else 0
-
-            if team not in team_points:
-                team_points[team] = {"points": 0, "drivers": []}
-
-            team_points[team]["points"] += points
-            team_points[team]["drivers"].append(
-                {
-                    "name": driver["FullName"],
-                    "abbreviation": driver["Abbreviation"],
-                    "points": points,
-                }
-            )
+        drivers = pd.DataFrame(
+            {
+                "team": results["TeamName"],
+                "name": results["FullName"],
+                "abbreviation": results["Abbreviation"],
+                "points": _points_column(results),
+            }
+        )
+        by_team = drivers.groupby("team", sort=False, dropna=False)
+        team_totals = (
+            by_team["points"].sum().sort_values(ascending=False, kind="stable")
+        )
+        team_drivers = {
+            team: group.drop(columns="team").to_dict(orient="records")
+            for team, group in by_team
+        }
 
-        # Convert to list and sort
-        standings_data = []
-        for position, (team, data) in enumerate(
-            sorted(team_points.items(), key=lambda x: x[1]["points"], reverse=True), 1
-        ):
-            standings_data.append(
-                {
-                    "position": position,
-                    "team": team,
-                    "points": data["points"],
-                    "drivers": data["drivers"],
-                }
-            )
+        standings_data = [
+            {
+                "position": position,
+                "team": team,
+                "points": float(points),
+                "drivers": team_drivers[team],
+            }
+            for position, (team, points) in enumerate(team_totals.items(), 1)
+        ]
 
         result = {
             "year": year,
@@ -447,13 +578,9 @@ async def get_constructor_standings(arguments: Dict[str, Any]) -> List[TextConte
             "standings": standings_data,
         }
 
-        return [
-            TextContent(
-                type="text",
-                text=f"F1 {year} Constructor Standings (after Round {round_number}):\n\n"
-                + json.dumps(result, indent=2),
-            )
-        ]
+        return _text_result(
+            f"F1 {year} Constructor Standings (after Round {round_number})", result
+        )
 
     except Exception as e:
         return [
@@ -463,57 +590,57 @@ async def get_constructor_standings(arguments: Dict[str, Any]) -> List[TextConte
         ]
 
 
+# Lap columns exposed by get_lap_times, mapped to their output keys
+_LAP_COLUMNS = {
+    "LapNumber": "lap_number",
+    "Driver": "driver",
+    "Team": "team",
+    "LapTime": "lap_time",
+    "Sector1Time": "sector_1",
+    "Sector2Time": "sector_2",
+    "Sector3Time": "sector_3",
+    "Compound": "compound",
+    "TyreLife": "tyre_life",
+}
+
+
 async def get_lap_times(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get lap times for a session."""
-    year = arguments["year"]
-    round_number = arguments["round_number"]
-    session_type = arguments["session"]
-    driver_filter = arguments.get("driver")
+    request = F1SessionRequest.model_validate(arguments)
+    if request.round_number is None:
+        raise ValueError("round_number is required")
+    year = request.year
+    round_number = request.round_number
+    session_type = request.session
+    driver_filter = request.driver
 
     try:
-        session = fastf1.get_session(year, round_number, session_type)
-        session.load()
+        cache_path = _derived_path(
+            "laps", year, round_number, session_type, driver_filter
+        )
+        text = await asyncio.to_thread(_read_derived, cache_path)
+        if text is not None:
+            return [TextContent(type="text", text=text)]
+
+        session = await _load_session(year, round_number, session_type)
 
         laps = session.laps
 
         # Filter by driver if specified
         if driver_filter:
-            laps = laps[laps["Driver"] == driver_filter.upper()]
-
-        # Convert lap times to readable format
-        lap_data = []
-        for _, lap in laps.iterrows():
-            lap_data.append(
-                {
-                    "lap_number": (
-                        int(lap["LapNumber"]) if pd.notna(lap["LapNumber"]) else None
-                    ),
-                    "driver": lap["Driver"],
-                    "team": lap["Team"],
-                    "lap_time": (
-                        str(lap["LapTime"]) if pd.notna(lap["LapTime"]) else None
-                    ),
-                    "sector_1": (
-                        str(lap["Sector1Time"])
-                        if pd.notna(lap.get("Sector1Time"))
-                        else None
-                    ),
-                    "sector_2": (
-                        str(lap["Sector2Time"])
-                        if pd.notna(lap.get("Sector2Time"))
-                        else None
-                    ),
-                    "sector_3": (
-                        str(lap["Sector3Time"])
-                        if pd.notna(lap.get("Sector3Time"))
-                        else None
-                    ),
-                    "compound": lap.get("Compound", "Unknown"),
-                    "tyre_life": (
-                        int(lap["TyreLife"]) if pd.notna(lap.get("TyreLife")) else None
-                    ),
-                }
-            )
+            by_driver = _driver_laps((year, round_number, session_type), session)
+            laps = by_driver.get(driver_filter.upper(), laps.iloc[0:0])
+
+        # Only convert the first 50 laps, for readability
+        total_laps = len(laps)
+        out = laps.head(50).reindex(columns=list(_LAP_COLUMNS))
+        for column in ("LapNumber", "TyreLife"):
+            out[column] = out[column].astype("Int64")
+        for column in ("LapTime", "Sector1Time", "Sector2Time", "Sector3Time"):
+            out[column] = out[column].astype("string")
+        out["Compound"] = out["Compound"].fillna("Unknown")
+        out = out.astype(object).where(out.notna(), None)
+        lap_data = out.rename(columns=_LAP_COLUMNS).to_dict(orient="records")
 
         result = {
             "year": year,
@@ -521,29 +648,55 @@ async def get_lap_times(arguments: Dict[str, Any]) -> List[TextContent]:
             "session": session_type,
             "event_name": session.event["EventName"],
             "driver_filter": driver_filter,
-            "total_laps": len(lap_data),
-            "laps": lap_data[:50],  # Limit to first 50 laps for readability
+            "total_laps": total_laps,
+            "laps": lap_data,
         }
 
-        if len(lap_data) > 50:
-            result["note"] = f"Showing first 50 of {len(lap_data)} laps"
-
-        return [
-            TextContent(
-                type="text",
-                text=f"F1 {year} Round {round_number} {session_type} Lap Times:\n\n"
-                + json.dumps(result, indent=2),
-            )
-        ]
+        if total_laps > 50:
+            result["note"] = f"Showing first 50 of {total_laps} laps"
+        content = _text_result(
+            f"F1 {year} Round {round_number} {session_type} Lap Times", result
+        )
+        await asyncio.to_thread(_write_derived, cache_path, content[0].text)
+        return content
 
     except Exception as e:
         return [TextContent(type="text", text=f"Error getting lap times: {str(e)}")]
 
 
+# Tool name -> handler, used by call_tool
+_DISPATCH = {
+    "get_race_schedule": get_race_schedule,
+    "get_session_results": get_session_results,
+    "get_driver_standings": get_driver_standings,
+    "get_constructor_standings": get_constructor_standings,
+    "get_lap_times": get_lap_times,
+}
+
+
+async def _warm_up() -> None:
+    """Prefetch the current season schedule in the background.
+
+    FastF1 already reuses one pooled ``requests`` session for its API calls;
+    fetching the schedule at startup opens that connection and fills the
+    schedule cache before the first tool call needs it.
+    """
+    try:
+        await asyncio.to_thread(_schedule, pd.Timestamp.now().year)
+    except Exception as e:
+        logger.warning("Schedule warm-up failed: %s", e)
+
+
 async def main():
     """Main entry point for the server."""
+    warm_up = asyncio.create_task(_warm_up())
     async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+        try:
+            await app.run(
+                read_stream, write_stream, app.create_initialization_options()
+            )
+        finally:
+            warm_up.cancel()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,11 @@ Test script for MCP Inspector compatibility
 
 import asyncio
 import json
-from f1_mcp_server.server import app
+import os
+from f1_mcp_server.server import call_tool, list_tools
+
+# Set VERBOSE=1 to print tool listings and response details
+VERBOSE = bool(os.environ.get("VERBOSE"))
 
 async def test_mcp_tools():
     """Test MCP tools directly."""
@@ -14,37 +18,39 @@ async def test_mcp_tools():
     
     # Test list_tools
     print("\n1. Testing list_tools...")
-    tools = await app.list_tools()
+    tools = await list_tools()
     print(f"Available tools: {len(tools)}")
-    for tool in tools:
-        print(f"  - {tool.name}: {tool.description}")
-    
-    # Test get_race_schedule
-    print("\n2. Testing get_race_schedule...")
-    try:
-        result = await app.call_tool("get_race_schedule", {"year": 2024})
-        print("✅ Race schedule retrieved successfully")
-        print(f"Response length: {len(result[0].text)} characters")
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    if VERBOSE:
+        for tool in tools:
+            print(f"  - {tool.name}: {tool.description}")
     
-    # Test get_session_results
-    print("\n3. Testing get_session_results...")
-    try:
-        result = await app.call_tool("get_session_results", {
-            "year": 2024,
-            "round_number": 1,
-            "session": "R"
-        })
-        print("✅ Session results retrieved successfully")
-        print(f"Response length: {len(result[0].text)} characters")
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    # Tool calls are independent, so run them concurrently
+    checks = [
+        ("get_race_schedule", {"year": 2024}, "Race schedule"),
+        (
+            "get_session_results",
+            {"year": 2024, "round_number": 1, "session": "R"},
+            "Session results",
+        ),
+    ]
+    print(f"\n2. Testing {', '.join(name for name, _, _ in checks)}...")
+    results = await asyncio.gather(
+        *(call_tool(name, arguments) for name, arguments, _ in checks),
+        return_exceptions=True,
+    )
+    for (name, _, label), result in zip(checks, results):
+        if isinstance(result, Exception):
+            print(f"❌ {name} error: {result}")
+            continue
+        print(f"✅ {label} retrieved successfully")
+        if VERBOSE:
+            print(f"Response length: {len(result[0].text)} characters")
     
     print("\n✅ MCP tool testing completed!")
-    print("\nTo test with MCP Inspector:")
-    print("1. Install: npm install -g @modelcontextprotocol/inspector")
-    print("2. Run: mcp-inspector python -m f1_mcp_server.server")
+    if VERBOSE:
+        print("\nTo test with MCP Inspector:")
+        print("1. Install: npm install -g @modelcontextprotocol/inspector")
+        print("2. Run: mcp-inspector python -m f1_mcp_server.server")
 
 if __name__ == "__main__":
     asyncio.run(test_mcp_tools())
\ No newline at end of file
@@ -4,11 +4,15 @@ Test runner for F1 MCP Server
 """
 
 import asyncio
+import os
 import subprocess
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor
 
+# Set VERBOSE=1 to echo test output and manual testing hints
+VERBOSE = bool(os.environ.get("VERBOSE"))
+
 async def test_mcp_server():
     """Test MCP server functionality."""
     print("🧪 Testing MCP Server...")
@@ -21,7 +25,8 @@ async def test_mcp_server():
         
         if result.returncode == 0:
             print("✅ MCP server test passed")
-            print(result.stdout)
+            if VERBOSE:
+                print(result.stdout)
         else:
             print("❌ MCP server test failed")
             print(result.stderr)
@@ -75,10 +80,11 @@ async def main():
     await test_http_server()
     
     print("\n🏁 Test suite completed!")
-    print("\nManual testing:")
-    print("1. MCP Inspector: mcp-inspector uv run python -m f1_mcp_server.server")
-    print("2. HTTP OAuth flow: uv run python test_client.py")
-    print("3. HTTP streaming: curl -H 'Authorization: Bearer <token>' http://localhost:8080/f1/stream")
+    if VERBOSE:
+        print("\nManual testing:")
+        print("1. MCP Inspector: mcp-inspector uv run python -m f1_mcp_server.server")
+        print("2. HTTP OAuth flow: uv run python test_client.py")
+        print("3. HTTP streaming: curl -H 'Authorization: Bearer <token>' http://localhost:8080/f1/stream")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
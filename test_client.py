@@ -6,9 +6,11 @@ Demonstrates OAuth flow and HTTP streaming
 
 import asyncio
 import json
+import sys
 import urllib.parse
-import urllib.request
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+import httpx
 
 class F1TestClient:
     """Test client for F1 MCP Server."""
@@ -18,6 +20,15 @@ class F1TestClient:
         self.client_id = "f1-mcp-client"
         self.client_secret = "f1-mcp-secret-key"
         self.access_token = None
+        self._http = None
+    
+    async def __aenter__(self):
+        # One pooled async client for every request; streams have no read timeout
+        self._http = httpx.AsyncClient(base_url=self.base_url, timeout=httpx.Timeout(10.0, read=None))
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self._http.aclose()
     
     def get_authorization_url(self) -> str:
         """Get OAuth authorization URL."""
@@ -30,7 +41,7 @@ class F1TestClient:
         }
         return f"{self.base_url}/authorize?{urllib.parse.urlencode(params)}"
     
-    def exchange_code_for_token(self, authorization_code: str) -> Dict[str, Any]:
+    async def exchange_code_for_token(self, authorization_code: str) -> Dict[str, Any]:
         """Exchange authorization code for access token."""
         data = {
             "grant_type": "authorization_code",
@@ -40,34 +51,64 @@ class F1TestClient:
             "redirect_uri": f"{self.base_url}/callback"
         }
         
-        encoded_data = urllib.parse.urlencode(data).encode()
-        
-        req = urllib.request.Request(
-            f"{self.base_url}/token",
-            data=encoded_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-        
-        with urllib.request.urlopen(req) as response:
-            token_data = json.loads(response.read().decode())
-            self.access_token = token_data["access_token"]
-            return token_data
+        response = await self._http.post("/token", data=data)
+        response.raise_for_status()
+        token_data = response.json()
+        self.access_token = token_data["access_token"]
+        return token_data
     
-    async def test_stream(self, year: int = 2024):
-        """Test F1 data streaming."""
+    async def test_stream(self, year: int = 2024) -> int:
+        """Consume the F1 data stream for a year, returning the number of events."""
         if not self.access_token:
             raise ValueError("No access token. Please authenticate first.")
         
         print(f"🏎️  Testing F1 stream for year {year}...")
         
-        # This is a simplified example - in practice you'd use aiohttp or similar
-        print(f"Stream URL: {self.base_url}/f1/stream?year={year}")
-        print(f"Authorization: Bearer {self.access_token}")
-        print("\nTo test streaming, use curl:")
-        print(f'curl -H "Authorization: Bearer {self.access_token}" "{self.base_url}/f1/stream?year={year}"')
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        events = 0
+        async with self._http.stream("GET", "/f1/stream", params={"year": year}, headers=headers) as response:
+            response.raise_for_status()
+            event_type = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event_type = line[7:]
+                elif line.startswith("data: "):
+                    events += 1
+                    data = json.loads(line[6:])
+                    print(f"   [{year}] {event_type}: {data.get('message', data)}")
+                    if event_type in ("f1_complete", "f1_error"):
+                        break
+        
+        return events
+    
+    async def test_streams(self, years: List[int]) -> List[Any]:
+        """Consume the streams for several years concurrently."""
+        return await asyncio.gather(
+            *(self.test_stream(year) for year in years), return_exceptions=True
+        )
+
+async def run_client(auth_code: str, years: List[int]):
+    """Exchange the code for a token and stream the requested years."""
+    async with F1TestClient() as client:
+        # Step 3: Exchange code for token
+        print("\n3. Exchanging code for access token...")
+        token_data = await client.exchange_code_for_token(auth_code)
+        print(f"✅ Access token obtained: {token_data['access_token'][:20]}...")
+        print(f"   Expires in: {token_data['expires_in']} seconds")
+        
+        # Step 4: Test streaming
+        print("\n4. Testing stream endpoint...")
+        results = await client.test_streams(years)
+        for year, result in zip(years, results):
+            if isinstance(result, Exception):
+                print(f"❌ Stream {year} error: {result}")
+            else:
+                print(f"✅ Stream {year} completed with {result} events")
 
 def main():
     """Main test function."""
+    # Years to stream concurrently, e.g. `python test_client.py 2023 2024`
+    years = [int(arg) for arg in sys.argv[1:]] or [2024]
     client = F1TestClient()
     
     print("🏎️  F1 MCP Server Test Client")
@@ -85,18 +126,9 @@ def main():
         return
     
     try:
-        # Step 3: Exchange code for token
-        print("\n3. Exchanging code for access token...")
-        token_data = client.exchange_code_for_token(auth_code)
-        print(f"✅ Access token obtained: {token_data['access_token'][:20]}...")
-        print(f"   Expires in: {token_data['expires_in']} seconds")
-        
-        # Step 4: Test streaming
-        print("\n4. Testing stream endpoint...")
-        asyncio.run(client.test_stream())
-        
+        asyncio.run(run_client(auth_code, years))
     except Exception as e:
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()